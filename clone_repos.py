@@ -1,41 +1,263 @@
 import os
 import shutil
+import hashlib
 import argparse
+import threading
+import subprocess
+import time
 import urllib.parse
-from typing import List
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
-from message_generation.helpers import is_bash, is_windows, import_repos, RepositoryInfo
+from message_generation.helpers import is_windows, import_repos, RepositoryInfo
 
+try:
+    # optional: clone in-process with libgit2 instead of spawning git
+    import pygit2
+except ImportError:
+    pygit2 = None
 
-def exec_clone(url: str, branch: str, destination: str) -> None:
+# serializes console output from concurrent clone/copy workers
+PRINT_LOCK = threading.Lock()
+
+# transient network failures are retried with exponential backoff
+CLONE_ATTEMPTS = 3
+
+# default location of the bare mirrors reused across runs
+DEFAULT_MIRROR_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "ros_msg_bridge")
+
+# one lock per mirror so repos sharing a URL don't update it concurrently
+MIRROR_LOCKS: Dict[str, threading.Lock] = {}
+MIRROR_LOCKS_LOCK = threading.Lock()
+# mirrors already created or updated in this run. Each mirror is refreshed at
+# most once, so clones that borrow from it never race with a later update.
+REFRESHED_MIRRORS = set()
+
+
+@dataclass
+class CloneOptions:
+    # number of parallel jobs git uses internally to fetch submodules.
+    # Not used when cloning with pygit2.
+    git_jobs: int = os.cpu_count() or 1
+    # only fetch the tip of the requested branch instead of the full history
+    shallow: bool = False
+    # directory of bare mirrors to borrow objects from. None disables mirrors.
+    mirror_cache: Optional[str] = None
+
+
+def locked_print(message: str) -> None:
+    with PRINT_LOCK:
+        print(message)
+
+
+def run_git(command: List[str]) -> subprocess.CompletedProcess:
+    # capture git's output so concurrent clones print as whole blocks
+    result = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        check=False,
+    )
+    if result.stdout:
+        locked_print(result.stdout.rstrip())
+    return result
+
+
+def get_mirror_lock(mirror_path: str) -> threading.Lock:
+    with MIRROR_LOCKS_LOCK:
+        if mirror_path not in MIRROR_LOCKS:
+            MIRROR_LOCKS[mirror_path] = threading.Lock()
+        return MIRROR_LOCKS[mirror_path]
+
+
+def ensure_mirror(url: str, cache_dir: str) -> Optional[str]:
+    """
+    Creates or updates a bare mirror of a repository in the cache directory.
+    Later calls for the same URL in this run reuse the mirror as is.
+
+    :param url: The URL of the repository to mirror.
+    :param cache_dir: The directory containing the mirrors.
+    :return: The path to the mirror, or None if it couldn't be created.
+        A mirror that fails to update is still returned.
+    """
+    mirror_name = hashlib.sha1(url.encode()).hexdigest() + ".git"
+    mirror_path = os.path.join(cache_dir, mirror_name)
+    with get_mirror_lock(mirror_path):
+        if mirror_path in REFRESHED_MIRRORS:
+            return mirror_path
+        if os.path.isdir(mirror_path):
+            locked_print(f"Updating mirror of {url}")
+            command = ["git", "-C", mirror_path, "remote", "update", "--prune"]
+            if run_git(command).returncode != 0:
+                # a stale mirror is still a valid object source, keep it
+                locked_print(f"Failed to update mirror of {url}. Using it as is.")
+        else:
+            locked_print(f"Mirroring {url} to {mirror_path}")
+            os.makedirs(cache_dir, exist_ok=True)
+            command = ["git", "clone", "--mirror", url, mirror_path]
+            if run_git(command).returncode != 0:
+                shutil.rmtree(mirror_path, ignore_errors=True)
+                return None
+        REFRESHED_MIRRORS.add(mirror_path)
+    return mirror_path
+
+
+def update_pygit2_submodules(repo: "pygit2.Repository", depth: int) -> None:
+    # initialize nested submodules too, like git clone --recurse-submodules.
+    # libgit2 fetches them one at a time, so --git-jobs has no effect here.
+    repo.submodules.update(init=True, depth=depth)
+    for submodule in repo.submodules:
+        update_pygit2_submodules(submodule.open(), depth)
+
+
+def exec_pygit2_clone(
+    url: str, branch: str, destination: str, options: CloneOptions
+) -> subprocess.CompletedProcess:
+    args = ["pygit2.clone_repository", url, "-b", branch, destination]
+    depth = 1 if options.shallow else 0
+    try:
+        # use the proxy from the git config or environment, like the git CLI
+        repo = pygit2.clone_repository(
+            url, destination, checkout_branch=branch, depth=depth, proxy=True
+        )
+        update_pygit2_submodules(repo, depth)
+    except (pygit2.GitError, TypeError, ValueError) as error:
+        # older pygit2 releases reject the depth and proxy arguments
+        # with a TypeError, so fall back to git for those too
+        return subprocess.CompletedProcess(args, 1, stdout=str(error))
+    return subprocess.CompletedProcess(args, 0, stdout="")
+
+
+def exec_git_clone(
+    url: str, branch: str, destination: str, options: CloneOptions
+) -> subprocess.CompletedProcess:
+    command = [
+        "git",
+        "clone",
+        "--recurse-submodules",
+        f"--jobs={options.git_jobs}",
+    ]
+    if options.shallow:
+        command += ["--depth", "1", "--single-branch", "--shallow-submodules"]
+    if options.mirror_cache is not None:
+        mirror_path = ensure_mirror(url, options.mirror_cache)
+        if mirror_path is not None:
+            # borrow objects from the local mirror, then copy them so the
+            # clone doesn't depend on the cache afterwards
+            command += ["--reference", mirror_path, "--dissociate"]
+    command += [url, "-b", branch, destination]
+    return run_git(command)
+
+
+def exec_clone_attempt(
+    url: str, branch: str, destination: str, options: CloneOptions
+) -> subprocess.CompletedProcess:
+    # libgit2 can't borrow objects from a mirror, so use git when mirrors are on
+    if pygit2 is not None and options.mirror_cache is None:
+        result = exec_pygit2_clone(url, branch, destination, options)
+        if result.returncode == 0:
+            return result
+        # libgit2 doesn't support every transport and option the git CLI does
+        locked_print(f"pygit2 failed to clone {url}: {result.stdout}. Using git.")
+        shutil.rmtree(destination, ignore_errors=True)
+    return exec_git_clone(url, branch, destination, options)
+
+
+def exec_clone(
+    url: str, branch: str, destination: str, options: CloneOptions
+) -> Optional[subprocess.CompletedProcess]:
     if os.path.isdir(destination):
-        print(f"{url} already exists locally")
-        return
-    print(f"Cloning {url} to {destination}")
-    os.system(f"git clone {url} -b {branch} {destination}")
+        locked_print(f"{url} already exists locally")
+        return None
+    for attempt in range(CLONE_ATTEMPTS):
+        locked_print(f"Cloning {url} to {destination}")
+        result = exec_clone_attempt(url, branch, destination, options)
+        if result.returncode == 0:
+            return result
+        # don't leave a partial clone behind, later runs would skip it
+        shutil.rmtree(destination, ignore_errors=True)
+        if attempt + 1 < CLONE_ATTEMPTS:
+            delay = 2**attempt
+            locked_print(f"Failed to clone {url}. Retrying in {delay}s")
+            time.sleep(delay)
+    raise RuntimeError(f"Failed to clone {url} after {CLONE_ATTEMPTS} attempts")
+
+
+def remove_stale_entries(source: str, destination: str) -> None:
+    # copying over an existing tree keeps files that were deleted from the source
+    source_names = set(os.listdir(source))
+    with os.scandir(destination) as entries:
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if entry.name not in source_names:
+                if is_dir:
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+            elif is_dir:
+                remove_stale_entries(os.path.join(source, entry.name), entry.path)
+
+
+def copy_if_changed(source: str, destination: str) -> str:
+    # skip files whose size and mtime match the previous copy. copy2 keeps the
+    # mtime of the source, so files copied by an earlier run match here.
+    source_stat = os.stat(source)
+    try:
+        destination_stat = os.stat(destination)
+    except FileNotFoundError:
+        destination_stat = None
+    if (
+        destination_stat is not None
+        and destination_stat.st_size == source_stat.st_size
+        and destination_stat.st_mtime_ns == source_stat.st_mtime_ns
+    ):
+        return destination
+    return shutil.copy2(source, destination)
 
 
 def exec_copy(path: str, destination: str) -> None:
-    if os.path.isdir(destination):
-        shutil.rmtree(destination)
-    print(f"Copying {path} to {destination}")
-    shutil.copytree(path, destination)
-
-
-def clone(repos: List[RepositoryInfo], destination: str) -> None:
-    for repo in repos:
-        path = os.path.join(destination, repo.local_name)
-        result = urllib.parse.urlsplit(repo.uri)
-        if result.scheme == "file":
-            if is_windows():
-                source_path = result.path.replace("/", "\\")
-                if source_path[0] == "\\":
-                    source_path = source_path[1:]
-            else:
-                source_path = result.path
-            exec_copy(source_path, path)
+    locked_print(f"Copying {path} to {destination}")
+    try:
+        shutil.copytree(
+            path, destination, copy_function=copy_if_changed, dirs_exist_ok=True
+        )
+        remove_stale_entries(path, destination)
+    except OSError:
+        # fall back to a clean copy, ex. if a file was replaced by a directory
+        shutil.rmtree(destination, ignore_errors=True)
+        shutil.copytree(path, destination)
+
+
+def clone_repo(repo: RepositoryInfo, destination: str, options: CloneOptions) -> None:
+    path = os.path.join(destination, repo.local_name)
+    result = urllib.parse.urlsplit(repo.uri)
+    if result.scheme == "file":
+        if is_windows():
+            source_path = result.path.replace("/", "\\")
+            if source_path[0] == "\\":
+                source_path = source_path[1:]
         else:
-            exec_clone(repo.uri, repo.version, path)
+            source_path = result.path
+        exec_copy(source_path, path)
+    else:
+        exec_clone(repo.uri, repo.version, path, options)
+
+
+def clone(
+    repos: List[RepositoryInfo],
+    destination: str,
+    jobs: int = 8,
+    options: Optional[CloneOptions] = None,
+) -> None:
+    if options is None:
+        options = CloneOptions()
+    # clones and copies are independent and I/O bound, so overlap them.
+    # The pool is bounded to avoid spawning one git process per repo at once.
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        # consume the results so exceptions from workers are raised here
+        list(executor.map(lambda repo: clone_repo(repo, destination, options), repos))
 
 
 def main():
@@ -50,13 +272,49 @@ def main():
         type=str,
         help="Clone destination directory",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        default=8,
+        type=int,
+        help="Number of repositories to clone in parallel",
+    )
+    parser.add_argument(
+        "--git-jobs",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="Number of submodules each git clone fetches in parallel "
+        "(no effect when cloning with pygit2)",
+    )
+    parser.add_argument(
+        "--shallow",
+        action="store_true",
+        help="Only clone the latest commit of each repository",
+    )
+    parser.add_argument(
+        "--mirror-cache",
+        action="store_true",
+        help="Reuse objects from bare mirrors kept across runs",
+    )
+    parser.add_argument(
+        "--mirror-dir",
+        default=DEFAULT_MIRROR_CACHE,
+        type=str,
+        help="Directory of the bare mirrors used with --mirror-cache "
+        f"(default: {DEFAULT_MIRROR_CACHE})",
+    )
     args = parser.parse_args()
 
     sources = args.sources
     destination = args.destination
 
     repos = import_repos(sources)
-    clone(repos, destination)
+    options = CloneOptions(
+        git_jobs=args.git_jobs,
+        shallow=args.shallow,
+        mirror_cache=args.mirror_dir if args.mirror_cache else None,
+    )
+    clone(repos, destination, args.jobs, options)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 import os
+import sys
+import shutil
 import argparse
+import subprocess
 from typing import List
 
-from message_generation.helpers import import_repos, is_bash, is_windows, RepositoryInfo
+from message_generation.helpers import import_repos, is_windows, RepositoryInfo
 
 # skip building these packages since they're already installed
 SPECIAL_NAMES = [
@@ -11,39 +14,68 @@ SPECIAL_NAMES = [
 ]
 
 
-def exec_rospy_build(package_directory, gen_msg_root) -> None:
-    if is_bash():
-        os.system(f"rospy-build genmsg {package_directory} -s {gen_msg_root}")
-    else:
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        os.system(
-            f'{base_dir}\\venv\\Scripts\\rospy-build "genmsg" '
-            f'"{package_directory}" "-s" "{gen_msg_root}"'
-        )
+def get_script_path(name: str) -> str:
+    # console scripts are usually installed next to the interpreter of the active
+    # venv. Otherwise, ex. with pip install --user, look them up on PATH.
+    path = shutil.which(name, path=os.path.dirname(sys.executable))
+    if path is None:
+        path = shutil.which(name)
+    if path is None:
+        raise RuntimeError(f"Couldn't find {name}. Is it installed and on PATH?")
+    return path
+
+
+def exec_rospy_build(
+    package_directory: str, gen_msg_root: str, pythonpath: str
+) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            get_script_path("rospy-build"),
+            "genmsg",
+            package_directory,
+            "-s",
+            gen_msg_root,
+        ],
+        env=dict(os.environ, PYTHONPATH=pythonpath),
+        check=False,
+    )
 
 
-def exec_pip_install(package_directory: str) -> None:
-    if is_bash():
-        os.system(f"python3 -m pip install -e {package_directory}")
-    else:
-        os.system(f'python "-m" "pip" "install" "-e" "{package_directory}"')
+def exec_pip_install(package_directories: List[str]) -> subprocess.CompletedProcess:
+    # one pip invocation for all packages amortizes pip's startup and resolver.
+    # Generated message packages have no PyPI dependencies to resolve.
+    command = [sys.executable, "-m", "pip", "install", "--no-deps"]
+    for package_directory in package_directories:
+        command += ["-e", package_directory]
+    return subprocess.run(command, check=False)
 
 
 def find_package_dir(root: str) -> str:
-    for dirpath, dirnames, filenames in os.walk(root):
-        if "msg" in dirnames:
+    # depth-first search in the same order as os.walk, stopping at the first
+    # directory that contains a msg directory. Only subdirectories are kept
+    # from each listing; file names are never collected.
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as entries:
+                subdirs = [entry for entry in entries if entry.is_dir()]
+        except OSError:
+            continue
+        if any(entry.name == "msg" for entry in subdirs):
             return dirpath
+        stack.extend(
+            entry.path for entry in reversed(subdirs) if not entry.is_symlink()
+        )
     return ""
 
 
-def append_to_python_path(path: str) -> None:
-    pythonpath = os.environ.get("PYTHONPATH", "").strip()
-    if len(pythonpath) != 0 and pythonpath[0] != ":":
-        if is_windows():
-            pythonpath = ";" + pythonpath
-        else:
-            pythonpath = ":" + pythonpath
-    os.environ["PYTHONPATH"] = path + pythonpath
+def build_python_path(paths: List[str]) -> str:
+    # the newest paths go first, followed by the existing PYTHONPATH
+    existing = os.environ.get("PYTHONPATH", "").strip().strip(os.pathsep)
+    if len(existing) != 0:
+        paths = paths + [existing]
+    return os.pathsep.join(paths)
 
 
 def save_python_path(file_path: str) -> None:
@@ -63,6 +95,7 @@ def save_python_path(file_path: str) -> None:
 def generate_rospy_messages(repos: List[RepositoryInfo], gen_msg_root: str) -> None:
     if not os.path.isdir(gen_msg_root):
         os.makedirs(gen_msg_root)
+    package_dirs = []
     for repo in repos:
         if repo.local_name in SPECIAL_NAMES:
             continue
@@ -71,9 +104,16 @@ def generate_rospy_messages(repos: List[RepositoryInfo], gen_msg_root: str) -> N
         if len(package_dir) == 0:
             print(f"No message directory found in {repo.local_name}. Skipping.")
             continue
-        append_to_python_path(package_dir)
-        exec_rospy_build(package_dir, gen_msg_root)
-        exec_pip_install(package_dir)
+        package_dirs.append(package_dir)
+        result = exec_rospy_build(
+            package_dir, gen_msg_root, build_python_path(package_dirs[::-1])
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to build messages in {package_dir}")
+    os.environ["PYTHONPATH"] = build_python_path(package_dirs[::-1])
+    if len(package_dirs) > 0:
+        if exec_pip_install(package_dirs).returncode != 0:
+            raise RuntimeError("Failed to install the generated message packages")
     save_python_path(os.path.join(gen_msg_root, "set_build_python_path"))
 
 
@@ -1,45 +1,43 @@
 import os
-import json
 import argparse
 import inspect
-from importlib import import_module
 from typing import Iterable, List
+from concurrent.futures import ThreadPoolExecutor
 
 from message_conversion.ros_message import RosMessage
 from message_conversion.java_class_spec import JavaClassSpec
-from message_conversion.generate_spec import (
-    filter_unique_objects,
-    java_class_spec_generator,
-)
+from message_conversion.generate_spec import get_msg_module, java_class_spec_generator
 from message_conversion.code_artifacts import generate_java_code_from_spec
+from message_generation.helpers import load_json
 
 
-def write_java_file(root_path: str, relative_path: str, code: str) -> None:
+def write_java_file(root_path: str, relative_path: str, code: str) -> str:
     """
     Writes the generated Java code to a file at the specified path.
 
     :param root_path: The root path where the file should be created.
     :param relative_path: The relative path from the root path to the target file.
     :param code: The Java code to be written to the file.
+    :return: The absolute path of the written file.
     """
     # Create an absolute path by joining the root and relative paths
     abs_path = os.path.join(root_path, relative_path)
     # Determine the directory containing the target file
     abs_dir = os.path.dirname(abs_path)
 
-    # Check if the directory exists, if not, create it
-    if not os.path.isdir(abs_dir):
-        os.makedirs(abs_dir)
-
-    # Print the absolute path of the file being written
-    print(f"Writing to {abs_path}")
+    # Create the directory if it doesn't exist. Files are written concurrently,
+    # so another writer may create the same directory first.
+    os.makedirs(abs_dir, exist_ok=True)
 
     # Open the file in write mode and write the Java code to it
     with open(abs_path, "w") as file:
         file.write(code)
 
+    return abs_path
+
 
 def generate_from_messages(
+    java_root: str,
     root_path: str,
     messages: Iterable[RosMessage],
     default_messages: Iterable[RosMessage],
@@ -48,32 +46,49 @@ def generate_from_messages(
     """
     Generates Java code from ROS message specifications.
 
-    :param root_path: The root path where the Java files should be created.
+    :param java_root: The absolute path of the Java project root.
+    :param root_path: The path relative to java_root where the Java files should be created.
+        It also determines the Java package of the generated classes.
     :param messages: An iterable of ROS messages to be processed.
     :param default_messages: An iterable of ROS messages already generated in
         ROSNetworkTablesBridge (skip these messages).
     :param external_package: The package name for the generated Java code.
     :return: A dictionary of unique Java class specifications.
     """
-    # Create a blacklist of default ROS message types
-    blacklist = [msg._type for msg in default_messages]
+    # Create an immutable blacklist of default ROS message types.
+    # The same set is shared by every spec generation and code generation call.
+    blacklist = frozenset(msg._type for msg in default_messages)
 
     # Initialize a dictionary to store unique Java class specifications
     unique_objects = {}
 
-    # Generate Java class specifications for each ROS message
+    # Generate Java class specifications for each ROS message.
+    # Unique sub messages are collected while the specifications are generated.
     for msg in messages:
+        # Skip blacklisted messages and messages already found as sub messages
+        if msg._type in blacklist or msg._type in unique_objects:
+            continue
         class_spec = JavaClassSpec(msg._type)
-        java_class_spec_generator(class_spec, msg)
-        filter_unique_objects(unique_objects, class_spec, blacklist)
+        unique_objects[msg._type] = class_spec
+        java_class_spec_generator(class_spec, msg, unique_objects, blacklist)
+
+    # Resolve the destination once instead of depending on the working directory
+    abs_root_path = os.path.join(java_root, root_path)
 
-    # Generate Java code for each unique Java class specification
-    for spec in unique_objects.values():
+    def generate_java_file(spec: JavaClassSpec) -> str:
         relative_path, code = generate_java_code_from_spec(
             root_path, spec, external_package + ".messages.", blacklist
         )
         # Write the generated Java code to a file
-        write_java_file(root_path, relative_path, code)
+        return write_java_file(abs_root_path, relative_path, code)
+
+    # Generate Java code for each unique Java class specification.
+    # Each class is written to its own file, so overlap the file I/O.
+    with ThreadPoolExecutor() as executor:
+        # print the written paths here rather than in the workers, so lines
+        # don't interleave and keep the order of unique_objects
+        for abs_path in executor.map(generate_java_file, unique_objects.values()):
+            print(f"Writing to {abs_path}")
 
     return unique_objects
 
@@ -94,8 +109,7 @@ def import_sources(source_file_path: str) -> List[RosMessage]:
     :return: A list of ROS messages imported from the specified sources.
     """
     # Open the JSON file and load the "sources" key
-    with open(source_file_path) as file:
-        sources = json.load(file)["sources"]
+    sources = load_json(source_file_path)["sources"]
 
     # Initialize a list to store the imported ROS messages
     messages = []
@@ -103,10 +117,11 @@ def import_sources(source_file_path: str) -> List[RosMessage]:
     # Iterate through the sources and import the corresponding ROS messages
     for source in sources:
         # Split the source string into ROS package and message type
-        connection_header = source.split("/")
-        ros_pkg = connection_header[0] + ".msg"
-        msg_type = connection_header[1]
-        module = import_module(ros_pkg)
+        package_name, _, remainder = source.partition("/")
+        msg_type = remainder.partition("/")[0]
+        ros_pkg = package_name + ".msg"
+        # Many sources share a package, so the module import is cached
+        module = get_msg_module(ros_pkg)
         if msg_type == "*":
             classes = get_msg_classes(module)
             for msg_class in classes:
@@ -168,11 +183,10 @@ def main():
     # Import sources from the specified file path
     messages = import_sources(sources_file_path)
 
-    # Change the current working directory to the Java project root
-    os.chdir(java_root)
-
     # Generate Java code from the ROS messages
-    generate_from_messages(root_path, messages, default_messages, external_package)
+    generate_from_messages(
+        java_root, root_path, messages, default_messages, external_package
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 import os
 import re
-from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from dataclasses import dataclass, field as dataclass_field
+from typing import Iterable, List, Tuple
 from .constants import (
     JAVA_OBJECT_TO_PRIMITIVE,
     PRIMITIVE_DEFAULTS,
@@ -12,7 +13,11 @@ from .constants import (
 )
 from .java_class_spec import SPEC_PRIMITIVES, JavaClassSpec, JavaMessageField
 
+# runs of word separators in snake_case and kebab-case strings
+WORD_SEPARATORS = re.compile(r"[_-]+")
 
+
+@lru_cache(maxsize=4096)
 def camel_case(snake_str: str) -> str:
     """
     Converts a snake_case (words separated by _) or
@@ -22,23 +27,52 @@ def camel_case(snake_str: str) -> str:
     :param snake_str: a string
     :return: a string formatted in camelCase
     """
-    camel_str = re.sub(r"(_|-)+", " ", snake_str).title().replace(" ", "")
+    words = snake_str
+    # skip the regex substitution when there are no separators
+    if "_" in words or "-" in words:
+        words = WORD_SEPARATORS.sub(" ", words)
+    camel_str = words.title().replace(" ", "")
     return camel_str[0].lower() + camel_str[1:]
 
 
 @dataclass
 class GeneratedCodeArtifacts:
     """
-    A dataclass containing pieces of Java code to be inserted
-    into the larger Java file.
+    A dataclass collecting pieces of Java code to be inserted
+    into the larger Java file. Each list holds one snippet per field, in field order.
     """
 
-    fields_code: str  # non-static member fields code
-    arg: str  # constructor arguments
-    arg_assignment: str  # constructor argument assignment
-    getter: str  # getter method
-    setter: str  # setter method
-    json_constructor: str  # JSON builder code
+    # non-static member fields code
+    fields_code: List[str] = dataclass_field(default_factory=list)
+    # constructor arguments
+    arg: List[str] = dataclass_field(default_factory=list)
+    # constructor argument assignment
+    arg_assignment: List[str] = dataclass_field(default_factory=list)
+    # getter method
+    getter: List[str] = dataclass_field(default_factory=list)
+    # setter method
+    setter: List[str] = dataclass_field(default_factory=list)
+    # JSON builder code
+    json_constructor: List[str] = dataclass_field(default_factory=list)
+
+    def add(
+        self,
+        fields_code: str,
+        arg: str,
+        arg_assignment: str,
+        getter: str,
+        setter: str,
+        json_constructor: str,
+    ) -> None:
+        """
+        Appends the code snippets of one field.
+        """
+        self.fields_code.append(fields_code)
+        self.arg.append(arg)
+        self.arg_assignment.append(arg_assignment)
+        self.getter.append(getter)
+        self.setter.append(setter)
+        self.json_constructor.append(json_constructor)
 
 
 def get_full_type(
@@ -53,24 +87,62 @@ def get_full_type(
     :param field: JavaClassSpec object to generate a full type from.
     :return: full Java type.
     """
-
-    field_java_type = field.msg_type.replace("/", ".")
+    msg_type = field.msg_type
 
     # special case for wrapped primitives
     if isinstance(field, SPEC_PRIMITIVES):
-        return f"{external_package}{field_java_type}"
+        return external_package + msg_type.replace("/", ".")
 
-    if "." in field_java_type:
-        package, class_name = field_java_type.split(".")
-        class_name = get_class_special_case_package(package, class_name)
-        field_java_type = f"{package}.{class_name}"
-    full_type = f"{package_root}{field_java_type}"
-    return full_type
+    # message types are almost always `package/ClassName`, so split on the
+    # separator directly instead of replacing and splitting again
+    index = msg_type.find("/")
+    if index < 0:
+        return package_root + msg_type
+    package = msg_type[:index]
+    class_name = get_class_special_case_package(package, msg_type[index + 1 :])
+    return f"{package_root}{package}.{class_name}"
 
 
 INDENT = " " * 4
 
 
+def render_getter_template(full_type: str) -> str:
+    """
+    Renders the Java getter method template for a type.
+
+    :param full_type: the Java class' full type. See get_full_type()
+    :return: %-format template with `method` and `name` keys
+    """
+    return f"""{INDENT}public {full_type} %(method)s() {{
+        return this.%(name)s;
+    }}
+"""
+
+
+def render_setter_template(full_type: str) -> str:
+    """
+    Renders the Java setter method template for a type.
+
+    :param full_type: the Java class' full type. See get_full_type()
+    :return: %-format template with `method` and `name` keys
+    """
+    return f"""{INDENT}public void %(method)s({full_type} %(name)s) {{
+        this.%(name)s = %(name)s;
+    }}
+"""
+
+
+# Most fields are primitives, so render their templates once at import
+PRIMITIVE_GETTER_TEMPLATES = {
+    primitive.value: render_getter_template(primitive.value)
+    for primitive in JavaPrimitive
+}
+PRIMITIVE_SETTER_TEMPLATES = {
+    primitive.value: render_setter_template(primitive.value)
+    for primitive in JavaPrimitive
+}
+
+
 def getter_template(full_type: str, name: str) -> str:
     """
     Java code template for a getter method.
@@ -79,10 +151,10 @@ def getter_template(full_type: str, name: str) -> str:
     :param name: the name of the field.
     :return: Java code for the getter
     """
-    return f"""{INDENT}public {full_type} {camel_case('get_' + name)}() {{
-        return this.{name};
-    }}
-"""
+    template = PRIMITIVE_GETTER_TEMPLATES.get(full_type)
+    if template is None:
+        template = render_getter_template(full_type)
+    return template % {"method": camel_case("get_" + name), "name": name}
 
 
 def setter_template(full_type: str, name: str) -> str:
@@ -93,29 +165,38 @@ def setter_template(full_type: str, name: str) -> str:
     :param name: the name of the field.
     :return: Java code for the setter
     """
-    return f"""{INDENT}public void {camel_case('set_' + name)}({full_type} {name}) {{
-        this.{name} = {name};
-    }}
-"""
+    template = PRIMITIVE_SETTER_TEMPLATES.get(full_type)
+    if template is None:
+        template = render_setter_template(full_type)
+    return template % {"method": camel_case("set_" + name), "name": name}
 
 
 def generate_code_from_field(
-    imports: set, package_root: str, name: str, field: JavaMessageField
-) -> GeneratedCodeArtifacts:
+    artifacts: GeneratedCodeArtifacts,
+    imports: set,
+    package_root: str,
+    external_package: str,
+    name: str,
+    field: JavaMessageField,
+) -> None:
     """
     Generates code artifacts for a field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for the generated code.
+    :param external_package: External package for imports. Primitive fields don't use it.
     :param name: Field name.
     :param field: JavaMessageField object containing field information.
-    :return: GeneratedCodeArtifacts containing code snippets for the field.
     """
-    # Get the Java type of the field
-    field_java_type = field.msg_type.value
+    # Get the Java primitive and type of the field
+    primitive = field.msg_type
+    field_java_type = primitive.value
 
     # Generate field declaration code snippet
-    fields_code = f"{INDENT}private {field_java_type} {name} = {PRIMITIVE_DEFAULTS[field.msg_type]};\n"
+    fields_code = (
+        f"{INDENT}private {field_java_type} {name} = {PRIMITIVE_DEFAULTS[primitive]};\n"
+    )
 
     # Generate constructor argument code snippet
     arg = f"{field_java_type} {name}"
@@ -130,12 +211,12 @@ def generate_code_from_field(
     setter = setter_template(field_java_type, name)
 
     # Generate JSON parsing code snippet
-    json_parse = PRIMITIVE_JSON_FUNCTIONS[field.msg_type].format(
-        obj=f'jsonObj.get("{name}")'
+    json_prefix, json_suffix = PRIMITIVE_JSON_FUNCTIONS[primitive]
+    json_constructor = (
+        f'{INDENT * 2}this.{name} = {json_prefix}jsonObj.get("{name}"){json_suffix};\n'
     )
-    json_constructor = f"{INDENT * 2}this.{name} = {json_parse};\n"
 
-    return GeneratedCodeArtifacts(
+    artifacts.add(
         fields_code=fields_code,
         arg=arg,
         arg_assignment=arg_assignment,
@@ -146,15 +227,15 @@ def generate_code_from_field(
 
 
 def generate_code_from_arraylist_type(
-    imports: set, name: str, full_type: str
-) -> GeneratedCodeArtifacts:
+    artifacts: GeneratedCodeArtifacts, imports: set, name: str, full_type: str
+) -> None:
     """
     Generates code artifacts for an ArrayList field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param name: Field name.
     :param full_type: Full type of the ArrayList elements.
-    :return: GeneratedCodeArtifacts containing code snippets for the ArrayList field.
     """
     # Add required imports for ArrayList, Arrays, and JsonElement
     imports.add("import java.util.ArrayList;")
@@ -166,10 +247,10 @@ def generate_code_from_arraylist_type(
 
     # Determine the JSON parsing code based on the full_type
     if full_type in JAVA_OBJECT_TO_PRIMITIVE:
-        primitive = JavaPrimitive(JAVA_OBJECT_TO_PRIMITIVE[full_type].value)
-        new_from_json_code = PRIMITIVE_JSON_FUNCTIONS[primitive]
+        primitive = JAVA_OBJECT_TO_PRIMITIVE[full_type]
+        json_prefix, json_suffix = PRIMITIVE_JSON_FUNCTIONS[primitive]
     else:
-        new_from_json_code = f"new {full_type}({{obj}}.getAsJsonObject())"
+        json_prefix, json_suffix = f"new {full_type}(", ".getAsJsonObject())"
 
     # Generate field declaration code snippet
     fields_code = f"{INDENT}private {array_type} {name} = new ArrayList<>();\n"
@@ -189,12 +270,13 @@ def generate_code_from_arraylist_type(
     setter = setter_template(array_type, name)
 
     # Generate JSON parsing code snippet for ArrayList elements
-    json_constructor = f"""{INDENT * 2}for (JsonElement {name}_element : jsonObj.getAsJsonArray("{name}")) {{
-{INDENT * 3}this.{name}.add({new_from_json_code.format(obj=f"{name}_element")});
+    element = name + "_element"
+    json_constructor = f"""{INDENT * 2}for (JsonElement {element} : jsonObj.getAsJsonArray("{name}")) {{
+{INDENT * 3}this.{name}.add({json_prefix}{element}{json_suffix});
 {INDENT * 2}}}
 """
 
-    return GeneratedCodeArtifacts(
+    artifacts.add(
         fields_code=fields_code,
         arg=arg,
         arg_assignment=arg_assignment,
@@ -205,37 +287,37 @@ def generate_code_from_arraylist_type(
 
 
 def generate_code_from_static_array_type(
-    imports: set, name: str, full_type: str, size: int
-) -> GeneratedCodeArtifacts:
+    artifacts: GeneratedCodeArtifacts,
+    imports: set,
+    name: str,
+    full_type: str,
+    size: int,
+) -> None:
     """
     Generates code artifacts for a static array field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param name: Field name.
     :param full_type: Full type of the static array elements.
     :param size: Size of the static array.
-    :return: GeneratedCodeArtifacts containing code snippets for the static array field.
     """
     # Add required import for JsonElement
     imports.add("import com.google.gson.JsonElement;")
 
-    # Initialize variables
-    static_array_values = ""
-
     # Determine default value and JSON parsing code based on the full_type
     if full_type in JAVA_OBJECT_TO_PRIMITIVE:
-        primitive = JavaPrimitive(JAVA_OBJECT_TO_PRIMITIVE[full_type].value)
+        primitive = JAVA_OBJECT_TO_PRIMITIVE[full_type]
         value = PRIMITIVE_DEFAULTS[primitive]
         new_value_code = str(value)
-        new_from_json_code = PRIMITIVE_JSON_FUNCTIONS[primitive]
+        json_prefix, json_suffix = PRIMITIVE_JSON_FUNCTIONS[primitive]
     else:
         new_value_code = f"new {full_type}()"
-        new_from_json_code = f"new {full_type}({{obj}}.getAsJsonObject())"
+        json_prefix, json_suffix = f"new {full_type}(", ".getAsJsonObject())"
 
-    # Generate static array initialization values
-    for index in range(size):
-        static_array_values += f"\n{INDENT * 2}{new_value_code},"
-    static_array_values = static_array_values[:-1] + "\n    "
+    # Generate static array initialization values, one identical element per line
+    static_array_values = ",".join([f"\n{INDENT * 2}{new_value_code}"] * size)
+    static_array_values += f"\n{INDENT}"
 
     # Define the static array type
     array_type = f"{full_type}[]"
@@ -259,13 +341,14 @@ def generate_code_from_static_array_type(
     setter = setter_template(array_type, name)
 
     # Generate JSON parsing code snippet for static array elements
-    json_constructor = f"""        int {name}_element_index = 0;
-        for (JsonElement {name}_element : jsonObj.getAsJsonArray("{name}")) {{
-            this.{name}[{name}_element_index++] = {new_from_json_code.format(obj=f"{name}_element")};
+    element = name + "_element"
+    json_constructor = f"""        int {element}_index = 0;
+        for (JsonElement {element} : jsonObj.getAsJsonArray("{name}")) {{
+            this.{name}[{element}_index++] = {json_prefix}{element}{json_suffix};
         }}
 """
 
-    return GeneratedCodeArtifacts(
+    artifacts.add(
         fields_code=fields_code,
         arg=arg,
         arg_assignment=arg_assignment,
@@ -276,56 +359,69 @@ def generate_code_from_static_array_type(
 
 
 def generate_code_from_field_variable_list(
-    imports: set, package_root: str, name: str, field: JavaMessageField
-) -> GeneratedCodeArtifacts:
+    artifacts: GeneratedCodeArtifacts,
+    imports: set,
+    package_root: str,
+    external_package: str,
+    name: str,
+    field: JavaMessageField,
+) -> None:
     """
     Generates code artifacts for a variable-length list field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for Java classes.
+    :param external_package: External package for imports. Primitive fields don't use it.
     :param name: Field name.
     :param field: JavaMessageField instance representing the field.
-    :return: GeneratedCodeArtifacts containing code snippets for the variable-length list field.
     """
     # Call generate_code_from_arraylist_type to generate the code snippets
-    return generate_code_from_arraylist_type(
-        imports, name, PRIMITIVE_TO_JAVA_OBJECT[field.msg_type]
+    generate_code_from_arraylist_type(
+        artifacts, imports, name, PRIMITIVE_TO_JAVA_OBJECT[field.msg_type]
     )
 
 
 def generate_code_from_field_static_list(
-    imports: set, package_root: str, name: str, field: JavaMessageField
-) -> GeneratedCodeArtifacts:
+    artifacts: GeneratedCodeArtifacts,
+    imports: set,
+    package_root: str,
+    external_package: str,
+    name: str,
+    field: JavaMessageField,
+) -> None:
     """
     Generates code artifacts for a static-length list field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for Java classes.
+    :param external_package: External package for imports. Primitive fields don't use it.
     :param name: Field name.
     :param field: JavaMessageField instance representing the field.
-    :return: GeneratedCodeArtifacts containing code snippets for the static-length list field.
     """
     # Call generate_code_from_static_array_type to generate the code snippets
-    return generate_code_from_static_array_type(
-        imports, name, PRIMITIVE_TO_JAVA_OBJECT[field.msg_type], field.size
+    generate_code_from_static_array_type(
+        artifacts, imports, name, PRIMITIVE_TO_JAVA_OBJECT[field.msg_type], field.size
     )
 
 
 def generate_code_from_spec_sub_msg(
+    artifacts: GeneratedCodeArtifacts,
     imports: set,
     package_root: str,
     external_package: str,
     name: str,
     field: JavaClassSpec,
-) -> GeneratedCodeArtifacts:
+) -> None:
     """
     Generates code artifacts for a sub-message field in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for Java classes.
     :param name: Field name.
     :param field: JavaClassSpec instance representing the field.
-    :return: GeneratedCodeArtifacts containing code snippets for the sub-message field.
     """
     # Get the full type of the sub-message
     full_type = get_full_type(package_root, external_package, field)
@@ -348,7 +444,7 @@ def generate_code_from_spec_sub_msg(
     # Generate JSON parsing code snippet for sub-message
     json_constructor = f'{INDENT * 2}this.{name} = new {full_type}(jsonObj.get("{name}").getAsJsonObject());\n'
 
-    return GeneratedCodeArtifacts(
+    artifacts.add(
         fields_code=fields_code,
         arg=arg,
         arg_assignment=arg_assignment,
@@ -359,52 +455,111 @@ def generate_code_from_spec_sub_msg(
 
 
 def generate_code_from_spec_variable_list(
+    artifacts: GeneratedCodeArtifacts,
     imports: set,
     package_root: str,
     external_package: str,
     name: str,
     field: JavaClassSpec,
-) -> GeneratedCodeArtifacts:
+) -> None:
     """
     Generates code artifacts for a variable-length list field of a custom type in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for Java classes.
     :param name: Field name.
     :param field: JavaClassSpec instance representing the field.
-    :return: GeneratedCodeArtifacts containing code snippets for the variable-length list field.
     """
     # Call generate_code_from_arraylist_type to generate the code snippets
-    return generate_code_from_arraylist_type(
-        imports, name, get_full_type(package_root, external_package, field)
+    generate_code_from_arraylist_type(
+        artifacts, imports, name, get_full_type(package_root, external_package, field)
     )
 
 
 def generate_code_from_spec_static_list(
+    artifacts: GeneratedCodeArtifacts,
     imports: set,
     package_root: str,
     external_package: str,
     name: str,
     field: JavaClassSpec,
-) -> GeneratedCodeArtifacts:
+) -> None:
     """
     Generates code artifacts for a static-length list field of a custom type in a Java class.
 
+    :param artifacts: Code snippets of the class. The field's snippets are appended to it.
     :param imports: Set of imports. Required imports will be added to this set.
     :param package_root: Package root for Java classes.
     :param name: Field name.
     :param field: JavaClassSpec instance representing the field.
-    :return: GeneratedCodeArtifacts containing code snippets for the static-length list field.
     """
     # Call generate_code_from_static_array_type to generate the code snippets
-    return generate_code_from_static_array_type(
-        imports, name, get_full_type(package_root, external_package, field), field.size
+    generate_code_from_static_array_type(
+        artifacts,
+        imports,
+        name,
+        get_full_type(package_root, external_package, field),
+        field.size,
     )
 
 
+# Java code of a generated class. The template is parsed once here instead of
+# interpolating an f-string per class.
+CLASS_TEMPLATE = """// Auto generated!! Do not modify.
+package %(package_root)s%(package_name)s;
+
+%(import_code)s
+
+public class %(class_name)s extends %(external_package)sRosMessage {
+%(constants_code)s
+%(fields_code)s
+    @Expose(serialize = false, deserialize = false)
+    public final java.lang.String _type = "%(msg_type)s";
+
+    public %(class_name)s() {
+
+    }
+%(args_constructor)s
+    public %(class_name)s(JsonObject jsonObj) {
+%(json_constructor)s
+    }
+
+%(getters)s
+%(setters)s
+    public JsonObject toJSON() {
+        return ginst.toJsonTree(this).getAsJsonObject();
+    }
+
+    public java.lang.String toString() {
+        return ginst.toJson(this);
+    }
+}
+"""
+
+
+# field code generators keyed by the type of field and its size kind.
+# The size kind is -1 for not a list, 0 for a variable list, 1 for a fixed size list.
+# Every generator takes the same arguments so the table can be called directly.
+FIELD_CODE_GENERATORS = {
+    (JavaMessageField, -1): generate_code_from_field,
+    (JavaMessageField, 0): generate_code_from_field_variable_list,
+    (JavaMessageField, 1): generate_code_from_field_static_list,
+    (JavaClassSpec, -1): generate_code_from_spec_sub_msg,
+    (JavaClassSpec, 0): generate_code_from_spec_variable_list,
+    (JavaClassSpec, 1): generate_code_from_spec_static_list,
+}
+# time and duration specs are generated like any other sub message
+FIELD_CODE_GENERATORS.update(
+    {(spec_type, -1): generate_code_from_spec_sub_msg for spec_type in SPEC_PRIMITIVES}
+)
+
+
+@lru_cache(maxsize=32)
 def get_package_root(path: str) -> str:
     """
-    Convert a path to a Java class package
+    Convert a path to a Java class package.
+    Every class in a run shares the same path, so the result is cached.
 
     :param path: The path to the package.
     :return: The package root as a string.
@@ -425,7 +580,10 @@ def get_class_special_case_package(package: str, class_name: str) -> str:
 
 
 def generate_java_code_from_spec(
-    path: str, spec: JavaClassSpec, external_package: str, blacklist: List[str]
+    path: str,
+    spec: JavaClassSpec,
+    external_package: str,
+    blacklist: Iterable[str],
 ) -> Tuple[str, str]:
     """
     Generates Java code for a class based on a JavaClassSpec.
@@ -433,77 +591,56 @@ def generate_java_code_from_spec(
     :param path: The package path.
     :param spec: JavaClassSpec instance representing the class.
     :param external_package: External package for imports.
-    :param blacklist: List of fields that should use the external package.
+    :param blacklist: Message types that should use the external package.
     :return: Tuple with the path to the generated class and the generated code.
     """
+    # every field is checked against the blacklist, so make lookups constant time.
+    # This is free when the caller already passes a frozenset.
+    blacklist = frozenset(blacklist)
     package_name, class_name = spec.msg_type.split("/")
     project_package_root = get_package_root(path)
     class_name = get_class_special_case_package(package_name, class_name)
 
-    arg_strings = []
     imports = set()
 
-    # Initialize code snippets
-    fields_code = ""
-    args = ""
-    arg_assignment = ""
-    getters = ""
-    setters = ""
-    json_constructor = ""
+    # Collect the code snippets of every field. They're joined once after the loop
+    # since repeated string concatenation is quadratic in the size of the class.
+    artifacts = GeneratedCodeArtifacts()
 
     # Iterate through the fields of the JavaClassSpec
     for name, field in spec.fields.items():
+        # Generate code snippets based on the field type and size
+        try:
+            size_kind = field.size if field.size <= 0 else 1
+        except AttributeError:
+            size_kind = None
+        generator = FIELD_CODE_GENERATORS.get((type(field), size_kind))
+        if generator is None:
+            raise ValueError(f"Invalid object found in fields: {field}")
+
         if field.msg_type in blacklist:
             package_root = external_package
         else:
             package_root = project_package_root
 
-        # Generate code snippets based on the field type and size
-        if type(field) == JavaMessageField:
-            if field.size == -1:
-                results = generate_code_from_field(imports, package_root, name, field)
-            elif field.size == 0:
-                results = generate_code_from_field_variable_list(
-                    imports, package_root, name, field
-                )
-            else:
-                results = generate_code_from_field_static_list(
-                    imports, package_root, name, field
-                )
-        elif isinstance(field, JavaClassSpec):
-            if field.size == -1:
-                results = generate_code_from_spec_sub_msg(
-                    imports, package_root, external_package, name, field
-                )
-            elif field.size == 0:
-                results = generate_code_from_spec_variable_list(
-                    imports, package_root, external_package, name, field
-                )
-            else:
-                results = generate_code_from_spec_static_list(
-                    imports, package_root, external_package, name, field
-                )
-        else:
-            raise ValueError(f"Invalid object found in fields: {field}")
-
-        # Append the generated code snippets to the corresponding variables
-        fields_code += results.fields_code
-        arg_strings.append(results.arg)
-        arg_assignment += results.arg_assignment
-        getters += results.getter
-        setters += results.setter
-        json_constructor += results.json_constructor
+        generator(artifacts, imports, package_root, external_package, name, field)
 
     # Generate code for constants
-    constants_code = ""
+    constants_code_parts = []
     for name, value in spec.constants.items():
         java_type = PYTHON_TO_JAVA_PRIMITIVE_MAPPING[type(value)]
-        constants_code += f"{INDENT}public static {java_type.value} {name} = {value};\n"
-
-    # Join arguments and remove the last character from arg_assignment and json_constructor
-    args = ", ".join(arg_strings)
-    arg_assignment = arg_assignment[:-1]
-    json_constructor = json_constructor[:-1]
+        constants_code_parts.append(
+            f"{INDENT}public static {java_type.value} {name} = {value};\n"
+        )
+
+    # Join the code snippets and remove the last character from arg_assignment and json_constructor
+    constants_code = "".join(constants_code_parts)
+    fields_code = "".join(artifacts.fields_code)
+    args = ", ".join(artifacts.arg)
+    arg_assignment = "".join(artifacts.arg_assignment)[:-1]
+    getters = "".join(artifacts.getter)
+    setters = "".join(artifacts.setter)
+    json_constructor = "".join(artifacts.json_constructor)[:-1]
 
     # Add required imports
     imports.add("import com.google.gson.JsonObject;")
@@ -514,7 +651,7 @@ def generate_java_code_from_spec(
     import_code = "\n".join(imports)
 
     # Generate the constructor with arguments if there are any
-    if len(arg_strings) > 0:
+    if len(artifacts.arg) > 0:
         args_constructor = f"""
 {INDENT}public {class_name}({args}) {{
 {arg_assignment}
@@ -524,36 +661,20 @@ def generate_java_code_from_spec(
         args_constructor = ""
 
     # Generate the final Java code for the class
-    code = f"""// Auto generated!! Do not modify.
-package {project_package_root}{package_name};
-
-{import_code}
-
-public class {class_name} extends {external_package}RosMessage {{
-{constants_code}
-{fields_code}
-    @Expose(serialize = false, deserialize = false)
-    public final java.lang.String _type = "{spec.msg_type}";
-
-    public {class_name}() {{
-
-    }}
-{args_constructor}
-    public {class_name}(JsonObject jsonObj) {{
-{json_constructor}
-    }}
-
-{getters}
-{setters}
-    public JsonObject toJSON() {{
-        return ginst.toJsonTree(this).getAsJsonObject();
-    }}
-
-    public java.lang.String toString() {{
-        return ginst.toJson(this);
-    }}
-}}
-"""
+    code = CLASS_TEMPLATE % {
+        "package_root": project_package_root,
+        "package_name": package_name,
+        "import_code": import_code,
+        "class_name": class_name,
+        "external_package": external_package,
+        "constants_code": constants_code,
+        "fields_code": fields_code,
+        "msg_type": spec.msg_type,
+        "args_constructor": args_constructor,
+        "json_constructor": json_constructor,
+        "getters": getters,
+        "setters": setters,
+    }
 
     path = f"{package_name}/{class_name}.java"
 
@@ -93,14 +93,15 @@ PRIMITIVE_TO_JAVA_OBJECT = {
 }
 JAVA_OBJECT_TO_PRIMITIVE = {v: k for k, v in PRIMITIVE_TO_JAVA_OBJECT.items()}
 PRIMITIVE_JSON_FUNCTIONS = {
-    # JSON to Java primitive conversion code snippets
-    JavaPrimitive.boolean: "{obj}.getAsBoolean()",
-    JavaPrimitive.byte: "{obj}.getAsByte()",
-    JavaPrimitive.char: "(char){obj}.getAsByte()",
-    JavaPrimitive.short: "{obj}.getAsShort()",
-    JavaPrimitive.int: "{obj}.getAsInt()",
-    JavaPrimitive.long: "{obj}.getAsLong()",
-    JavaPrimitive.float: "{obj}.getAsFloat()",
-    JavaPrimitive.double: "{obj}.getAsDouble()",
-    JavaPrimitive.String: "{obj}.getAsString()",
+    # JSON to Java primitive conversion code snippets.
+    # The JSON element expression goes between the prefix and the suffix.
+    JavaPrimitive.boolean: ("", ".getAsBoolean()"),
+    JavaPrimitive.byte: ("", ".getAsByte()"),
+    JavaPrimitive.char: ("(char)", ".getAsByte()"),
+    JavaPrimitive.short: ("", ".getAsShort()"),
+    JavaPrimitive.int: ("", ".getAsInt()"),
+    JavaPrimitive.long: ("", ".getAsLong()"),
+    JavaPrimitive.float: ("", ".getAsFloat()"),
+    JavaPrimitive.double: ("", ".getAsDouble()"),
+    JavaPrimitive.String: ("", ".getAsString()"),
 }
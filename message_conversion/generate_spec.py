@@ -1,6 +1,7 @@
-import re
+from functools import lru_cache
 from importlib import import_module
-from typing import Dict, List, Type
+from types import ModuleType
+from typing import AbstractSet, Dict, Tuple, Type
 
 from .ros_message import RosMessage
 from .constants import ROS_TO_JAVA_PRIMITIVE_MAPPING, RosPrimitive
@@ -8,6 +9,22 @@ from .java_class_spec import JavaClassSpec, JavaTimeSpec, JavaDurationSpec
 
 MsgClassCacheMap = Dict[str, Type[RosMessage]]
 MSG_CLASS_CACHE: MsgClassCacheMap = {}
+MSG_MODULE_CACHE: Dict[str, ModuleType] = {}
+MsgInstanceCacheMap = Dict[Type[RosMessage], RosMessage]
+MSG_INSTANCE_CACHE: MsgInstanceCacheMap = {}
+
+
+def get_msg_module(ros_pkg: str) -> ModuleType:
+    """
+    Retrieves a ROS message module, importing it on first use.
+    Many message types share a module, so modules are cached separately from classes.
+
+    :param ros_pkg: The message module name. ex. `nav_msgs.msg`
+    :return: The imported ROS message module.
+    """
+    if ros_pkg not in MSG_MODULE_CACHE:
+        MSG_MODULE_CACHE[ros_pkg] = import_module(ros_pkg)
+    return MSG_MODULE_CACHE[ros_pkg]
 
 
 def get_msg_class(cache: MsgClassCacheMap, msg_type_name: str):
@@ -27,50 +44,62 @@ def get_msg_class(cache: MsgClassCacheMap, msg_type_name: str):
 
         # import the ROS message module.
         # ex. 'nav_msgs/Odometry' is equivalent to `from nav_msgs.msg import Odometry`
-        msg_class = getattr(import_module(ros_pkg), msg_type)
+        msg_class = getattr(get_msg_module(ros_pkg), msg_type)
         cache[msg_type_name] = msg_class
     return cache[msg_type_name]
 
 
-def is_msg_type_list(msg_type_name: str) -> bool:
+def get_default_msg_instance(
+    cache: MsgInstanceCacheMap, msg_class: Type[RosMessage]
+) -> RosMessage:
     """
-    Determines if the given message type name represents a list.
+    Retrieves a default constructed instance of a ROS message class.
+    The instance is only read from, so one instance is shared per class.
 
-    :param msg_type_name: The message type name.
-    :return: True if the message type name represents a list, False otherwise.
+    :param cache: A cache to store previously constructed ROS message instances.
+    :param msg_class: The ROS message class.
+    :return: A default constructed instance of the ROS message class.
     """
-    return msg_type_name.endswith("]")
+    if msg_class not in cache:
+        cache[msg_class] = msg_class()
+    return cache[msg_class]
 
 
-def get_list_size(msg_type_name: str) -> int:
+def parse_msg_type(msg_type_name: str) -> Tuple[str, int]:
     """
-    Extracts the size of the list from the given message type name.
+    Splits a message type name into its base type and list size.
     ROS list messages come in the format `package/data_type[size]`
 
     :param msg_type_name: The message type name.
-    :return: The size of the list, or 0 if the message type name does not represent a list.
+    :return: The base type and the size of the list. The size is -1 for not a list,
+        0 for a variable list, >0 for a fixed size list.
     """
-    pattern = r"^.+\[(\d+)\]"
-    match = re.search(pattern, msg_type_name)
-    if match is None:
-        return 0
-    else:
-        return int(match.group(1))
+    if not msg_type_name.endswith("]"):
+        return msg_type_name, -1
+    index = msg_type_name.rfind("[")
+    size = msg_type_name[index + 1 : -1]
+    return msg_type_name[:index], int(size) if size else 0
 
 
-def get_list_type(msg_type_name: str) -> str:
+@lru_cache(maxsize=None)
+def get_message_constant_names(msg_class: Type[RosMessage]) -> Tuple[str, ...]:
     """
-    Extracts the base type of the list from the given message type name.
-    ROS list messages come in the format `package/data_type[size]`
+    Finds the names of the constants of a ROS message class.
+    Message classes don't change after import, so the names are cached per class.
 
-    :param msg_type_name: The message type name.
-    :return: The base type of the list, or the original message type name if it does not represent a list.
+    :param msg_class: The ROS message class.
+    :return: The constant names in the order they're defined in the class.
     """
-    if is_msg_type_list(msg_type_name):
-        index = msg_type_name.rfind("[")
-        return msg_type_name[:index]
-    else:
-        return msg_type_name
+    # Get the set of slots (field names) for the message class
+    slots = set(msg_class.__slots__)
+
+    # Constants are the public, non-callable class attributes that aren't slots.
+    # Iterating over the class attributes preserves the order.
+    return tuple(
+        name
+        for name, value in vars(msg_class).items()
+        if not name.startswith("_") and not callable(value) and name not in slots
+    )
 
 
 def get_message_constants(msg_instance: RosMessage):
@@ -80,109 +109,97 @@ def get_message_constants(msg_instance: RosMessage):
     :param msg_instance: The instance of a ROS message class.
     :return: A dictionary containing the constants of the ROS message.
     """
-    # Get the set of slots (field names) for the message instance
-    slots = set(msg_instance.__slots__)
-
-    # Iterate through the attributes of the message class and filter out private attributes and callables
-    props = []
-    for name, value in vars(msg_instance.__class__).items():
-        if name.startswith("_"):
-            continue
-        if callable(value):
-            continue
-        props.append(name)
-
-    # Calculate the set difference between the attributes and slots to find the constants
-    constants = set(props).difference(slots)
+    return {
+        name: getattr(msg_instance, name)
+        for name in get_message_constant_names(type(msg_instance))
+    }
 
-    # Create a dictionary to store the constants and their values
-    constants_map = {}
-    for name in props:  # iterating over the list preserves the order
-        if name in constants:
-            constants_map[name] = getattr(msg_instance, name)
 
-    return constants_map
-
-
-def java_class_spec_generator(class_spec: JavaClassSpec, msg_instance: RosMessage):
+def java_class_spec_generator(
+    class_spec: JavaClassSpec,
+    msg_instance: RosMessage,
+    unique_objects: Dict[str, JavaClassSpec],
+    blacklist: AbstractSet[str],
+):
     """
     Generates a Java class specification based on a ROS message instance.
-    If the ROS message contains other ROS messages, recursively generate a Java class
-    specification for those sub messages.
+    If the ROS message contains other ROS messages, generate a Java class
+    specification for those sub messages. Each sub message type is only walked once.
+    Sub messages are walked depth-first with an explicit stack, in the same order
+    as a recursive walk.
 
     :param class_spec: A JavaClassSpec object to be populated with the properties of the ROS message.
     :param msg_instance: A ROS message instance to be converted to a Java class specification.
+    :param unique_objects: A dictionary of the unique Java class specifications found so far.
+        New sub message specifications are added to it.
+    :param blacklist: A set of message types to be excluded from the unique objects.
     """
-    # Iterate through the ROS message properties and their data types
-    for name, data_type in zip(msg_instance.__slots__, msg_instance._slot_types):
-        # name is the field name of the ROS message. ex. 'pose' for PoseStamped
-        # data_type is the ROS message data type. ex. geometry_msgs/Pose for PoseStamped.pose
-
-        # Check if the data type is a list, and if so, get its size and type
-        if is_msg_type_list(data_type):
-            size = get_list_size(data_type)
-            data_type = get_list_type(data_type)
-        else:
-            size = -1
-
-        # Try to convert the data type to a ROS primitive type
-        try:
-            data_primitive = RosPrimitive(data_type)
-        except ValueError:
-            data_primitive = None
-
-        # Get the current property value from the ROS message instance
-        value = getattr(msg_instance, name)
-
-        # If the data type is not a ROS primitive type, generate a sub-class specification
-        if data_primitive is None:
-            msg_class = get_msg_class(MSG_CLASS_CACHE, data_type)
-            sub_class_spec = class_spec.add_sub_msg(name, data_type, size)
-            java_class_spec_generator(sub_class_spec, msg_class())
-        # If the data type is a ROS time primitive, add a JavaTimeSpec to the class specification
-        elif data_primitive == RosPrimitive.time:
-            class_spec.add_sub_spec(name, JavaTimeSpec())
-        # If the data type is a ROS duration primitive, add a JavaDurationSpec to the class specification
-        elif data_primitive == RosPrimitive.duration:
-            class_spec.add_sub_spec(name, JavaDurationSpec())
-        # Otherwise, add a field to the class specification with the appropriate Java primitive type
-        else:
-            class_spec.add_field(
-                name, value, ROS_TO_JAVA_PRIMITIVE_MAPPING[data_primitive], size
-            )
-
-    # Add constants from the ROS message to the Java class specification
-    for name, value in get_message_constants(msg_instance).items():
-        class_spec.add_constant(name, value)
-
-
-def filter_unique_objects(
-    unique_objects: Dict[str, JavaClassSpec],
-    class_spec: JavaClassSpec,
-    blacklist: List[str],
-):
-    """
-    Recursively filters Java class specifications to keep only unique objects, excluding those in the blacklist.
-
-    :param unique_objects: A dictionary to store unique Java class specifications.
-    :param class_spec: The Java class specification to be checked for uniqueness.
-    :param blacklist: A list of message types to be excluded from the unique objects.
-    """
-    # If the message type of the class_spec is in the blacklist, return immediately
-    if class_spec.msg_type in blacklist:
-        return
-
-    # If the message type of the class_spec is already in the unique_objects, check if they are equal
-    if class_spec.msg_type in unique_objects:
-        assert unique_objects[class_spec.msg_type] == class_spec, (
-            "Found class specs that don't match: %s != %s"
-            % (unique_objects[class_spec.msg_type], class_spec)
+    # Each entry is a spec being populated, its ROS message instance, and an
+    # iterator over the ROS message properties and their data types that are left
+    stack = [
+        (
+            class_spec,
+            msg_instance,
+            zip(msg_instance.__slots__, msg_instance._slot_types),
         )
-    # If the message type is not in unique_objects, add it
-    else:
-        unique_objects[class_spec.msg_type] = class_spec
-
-    # Recursively filter the unique objects for fields of type JavaClassSpec
-    for field in class_spec.fields.values():
-        if type(field) == JavaClassSpec:
-            filter_unique_objects(unique_objects, field, blacklist)
+    ]
+    while stack:
+        class_spec, msg_instance, slots = stack[-1]
+        for name, data_type in slots:
+            # name is the field name of the ROS message. ex. 'pose' for PoseStamped
+            # data_type is the ROS message data type. ex. geometry_msgs/Pose for PoseStamped.pose
+
+            # Check if the data type is a list, and if so, get its size and type
+            data_type, size = parse_msg_type(data_type)
+
+            # Try to convert the data type to a ROS primitive type
+            try:
+                data_primitive = RosPrimitive(data_type)
+            except ValueError:
+                data_primitive = None
+
+            # If the data type is not a ROS primitive type, generate a sub-class specification
+            if data_primitive is None:
+                known_spec = unique_objects.get(data_type)
+                # If the sub message was already walked, reuse its definition
+                if known_spec is not None:
+                    class_spec.add_sub_spec(name, known_spec.resized(size))
+                    continue
+                sub_class_spec = class_spec.add_sub_msg(name, data_type, size)
+                # Blacklisted messages are generated elsewhere. Only their type is needed.
+                if data_type not in blacklist:
+                    unique_objects[data_type] = sub_class_spec
+                    msg_class = get_msg_class(MSG_CLASS_CACHE, data_type)
+                    sub_msg_instance = get_default_msg_instance(
+                        MSG_INSTANCE_CACHE, msg_class
+                    )
+                    # Walk the sub message next, then resume this message's properties
+                    stack.append(
+                        (
+                            sub_class_spec,
+                            sub_msg_instance,
+                            zip(
+                                sub_msg_instance.__slots__, sub_msg_instance._slot_types
+                            ),
+                        )
+                    )
+                    break
+            # If the data type is a ROS time primitive, add a JavaTimeSpec to the class specification
+            elif data_primitive == RosPrimitive.time:
+                class_spec.add_sub_spec(name, JavaTimeSpec())
+            # If the data type is a ROS duration primitive, add a JavaDurationSpec to the class specification
+            elif data_primitive == RosPrimitive.duration:
+                class_spec.add_sub_spec(name, JavaDurationSpec())
+            # Otherwise, add a field to the class specification with the appropriate Java primitive type
+            else:
+                # Get the default property value from the ROS message instance
+                value = getattr(msg_instance, name)
+                class_spec.add_field(
+                    name, value, ROS_TO_JAVA_PRIMITIVE_MAPPING[data_primitive], size
+                )
+        else:
+            # All properties are done. Add constants from the ROS message to the
+            # Java class specification.
+            for name, value in get_message_constants(msg_instance).items():
+                class_spec.add_constant(name, value)
+            stack.pop()
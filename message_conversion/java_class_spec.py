@@ -1,20 +1,55 @@
+import sys
+import copy
 from dataclasses import dataclass
-from typing import Dict, Union
+from typing import Dict, List, Union
 
 from .constants import JavaPrimitive, PythonPrimitive
 
 
-@dataclass
+@dataclass(frozen=True)
 class JavaMessageField:
     """
     Represents a Java class primitive field and its corresponding value.
     size is -1 for not a list, 0 for a variable list, >0 for a fixed size list.
+    Fields are immutable so they can be shared between specs, see TIME_FIELDS.
+
+    Fields can still be copied and pickled:
+
+    >>> import copy, pickle
+    >>> field = JavaMessageField(0, JavaPrimitive.int, -1)
+    >>> copy.copy(field) == field and copy.deepcopy(field) == field
+    True
+    >>> pickle.loads(pickle.dumps(field)) == field
+    True
     """
 
+    # one instance per primitive field, so skip the per-instance __dict__
+    __slots__ = ("value", "msg_type", "size")
+
     value: PythonPrimitive
     msg_type: JavaPrimitive
     size: int
 
+    def __getstate__(self) -> tuple:
+        return self.value, self.msg_type, self.size
+
+    def __setstate__(self, state: tuple) -> None:
+        # frozen dataclasses reject attribute assignment, so copy and pickle
+        # can't restore the slots the default way
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+# indent strings of the default tab size, indexed by depth
+INDENTS = tuple(" " * (depth * 4) for depth in range(16))
+
+# the secs and nsecs fields of the time and duration primitives.
+# They never change, so every time and duration spec shares them.
+TIME_FIELDS = {
+    "secs": JavaMessageField(0, JavaPrimitive.int, -1),
+    "nsecs": JavaMessageField(0, JavaPrimitive.int, -1),
+}
+
 
 class JavaClassSpec:
     def __init__(self, msg_type_name: str, size=-1) -> None:
@@ -26,7 +61,8 @@ class JavaClassSpec:
         """
         self.fields: Dict[str, Union[JavaMessageField, JavaClassSpec]] = {}
         self.constants: Dict[str, PythonPrimitive] = {}
-        self.msg_type = msg_type_name
+        # names repeat across many specs, so share one string object per name
+        self.msg_type = sys.intern(msg_type_name)
         self.size = size
 
     def add_constant(self, name: str, value: PythonPrimitive) -> None:
@@ -36,7 +72,7 @@ class JavaClassSpec:
         :param name: The name of the constant.
         :param value: The value of the constant.
         """
-        self.constants[name] = value
+        self.constants[sys.intern(name)] = value
 
     def add_field(
         self, name: str, value: PythonPrimitive, msg_type: JavaPrimitive, size=-1
@@ -50,7 +86,7 @@ class JavaClassSpec:
         :param size: The size of the list, -1 for not a list, 0 for a variable list, >0 for a fixed size list.
         """
         # Add a new JavaMessageField to the fields dictionary
-        self.fields[name] = JavaMessageField(value, msg_type, size)
+        self.fields[sys.intern(name)] = JavaMessageField(value, msg_type, size)
 
     def add_sub_msg(self, name: str, msg_type_name: str, size=-1) -> "JavaClassSpec":
         """
@@ -75,25 +111,42 @@ class JavaClassSpec:
         :param spec: The JavaClassSpec object for the submessage.
         """
         # Add the JavaClassSpec to the fields dictionary
-        self.fields[name] = spec
+        self.fields[sys.intern(name)] = spec
 
-    def _to_str(self, indent=0, tab_size=4) -> str:
+    def resized(self, size: int) -> "JavaClassSpec":
+        """
+        Creates a copy of the class specification with a different list size.
+        The copy shares its fields and constants with this specification,
+        so a message type's definition is only built once.
+
+        :param size: The size of the list, -1 for not a list, 0 for a variable list, >0 for a fixed size list.
+        :return: The shallow copy of this JavaClassSpec.
+        """
+        spec = copy.copy(self)
+        spec.size = size
+        return spec
+
+    def _to_str(self, buffer: List[str], indent=0, tab_size=4) -> None:
         """
         Convert JavaClassSpec object to str for debug purposes. Does not generate Java code.
+        Nested specs append to the same buffer, which is joined once by __repr__.
 
-        :return: A string containing all the names and properties formatted for human readability.
+        :param buffer: A list the pieces of the string are appended to.
         """
         indent += 1
-        field_indent_str = " " * (indent * tab_size)
-        string = f"{self.msg_type}:\n"
+        if tab_size == 4 and indent < len(INDENTS):
+            field_indent_str = INDENTS[indent]
+        else:
+            field_indent_str = " " * (indent * tab_size)
+        buffer.append(f"{self.msg_type}:\n")
         for name, value in self.fields.items():
-            if type(value) == JavaMessageField:
-                string += f"{field_indent_str}{name}: {value}\n"
+            if type(value) is JavaMessageField:
+                buffer.append(f"{field_indent_str}{name}: {value}\n")
             elif isinstance(value, JavaClassSpec):
-                string += f"{field_indent_str}{name} {value._to_str(indent)}"
+                buffer.append(f"{field_indent_str}{name} ")
+                value._to_str(buffer, indent, tab_size)
             else:
                 raise ValueError(f"Invalid object found in fields: {value}")
-        return string
 
     def __eq__(self, __value: object) -> bool:
         """
@@ -101,45 +154,51 @@ class JavaClassSpec:
         If the other object is not JavaClassSpec, they are not equal.
         Otherwise, check if all the fields and values match.
         """
-        if type(__value) == JavaClassSpec:
+        if type(__value) is JavaClassSpec:
+            # specs of a repeated sub message share their fields, see resized()
+            if self.fields is __value.fields:
+                return True
             if self.fields.keys() != __value.fields.keys():
                 return False
             for name, field in self.fields.items():
                 other_field = __value.fields[name]
-                if type(field) != type(other_field):
+                field_type = type(field)
+                if field_type is not type(other_field):
                     return False
-                if type(field) == JavaMessageField and (
-                    field.value != other_field.value  # type: ignore
-                    or field.msg_type != other_field.msg_type
-                ):
-                    return False
-                elif type(field) == JavaClassSpec and field != other_field:
+                # time and duration specs only need matching types
+                if field_type in COMPARED_FIELD_TYPES and field != other_field:
                     return False
             return True
         else:
             return False
 
     def __repr__(self) -> str:
-        return self._to_str()
+        """
+        :return: A string containing all the names and properties formatted for human readability.
+        """
+        buffer: List[str] = []
+        self._to_str(buffer)
+        return "".join(buffer)
 
 
 class JavaTimeSpec(JavaClassSpec):
     def __init__(self) -> None:
         super().__init__("TimePrimitive", -1)
 
-        self.add_field("secs", 0, JavaPrimitive.int, -1)
-        self.add_field("nsecs", 0, JavaPrimitive.int, -1)
+        self.fields.update(TIME_FIELDS)
 
 
 class JavaDurationSpec(JavaClassSpec):
     def __init__(self) -> None:
         super().__init__("DurationPrimitive", -1)
 
-        self.add_field("secs", 0, JavaPrimitive.int, -1)
-        self.add_field("nsecs", 0, JavaPrimitive.int, -1)
+        self.fields.update(TIME_FIELDS)
 
 
 SPEC_PRIMITIVES = (
     JavaDurationSpec,
     JavaTimeSpec,
 )
+
+# field types that JavaClassSpec.__eq__ compares by value
+COMPARED_FIELD_TYPES = frozenset((JavaMessageField, JavaClassSpec))
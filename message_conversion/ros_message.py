@@ -2,6 +2,12 @@ from typing import List, Protocol
 
 
 class RosMessage(Protocol):
+    """
+    Structural type of a generated ROS message class, for type checking only.
+    It's deliberately not runtime_checkable. isinstance checks against a Protocol
+    probe every attribute on each call, so code should rely on the attributes directly.
+    """
+
     _type: str
     _slot_types: List[str]
     __slots__: List[str]
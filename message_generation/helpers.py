@@ -1,17 +1,40 @@
 import os
-import json
 import platform
-from typing import List
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, List
 from dataclasses import dataclass
 
+try:
+    # orjson is an optional, faster drop-in for the stdlib parser
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 @dataclass
 class RepositoryInfo:
+    __slots__ = ("local_name", "uri", "version")
+
     local_name: str
     uri: str
     version: str
 
 
+# reads the RepositoryInfo arguments out of a repos entry, in order
+GET_REPOSITORY_INFO = itemgetter("local-name", "uri", "version")
+
+
+def load_json(file_path: str) -> Any:
+    """
+    Loads a JSON file. Uses orjson if it's installed, otherwise the stdlib json module.
+
+    :param file_path: The path to the JSON file.
+    :return: The parsed JSON document.
+    """
+    return json_loads(Path(file_path).read_bytes())
+
+
 def import_repos(source_file_path: str) -> List[RepositoryInfo]:
     """
     Imports repository info from a JSON file.
@@ -19,21 +42,21 @@ def import_repos(source_file_path: str) -> List[RepositoryInfo]:
     :param source_file_path: The path to the JSON file containing the repos.
     :return: A list of objects containing info about the specified repos.
     """
-    # Open the JSON file and load the "sources" key
-    with open(source_file_path) as file:
-        repos = json.load(file)["repos"]
+    # Open the JSON file and load the "repos" key
+    repos = load_json(source_file_path)["repos"]
+
+    # store each repo in an object
+    return [RepositoryInfo(*GET_REPOSITORY_INFO(repo)) for repo in repos]
+
 
-    # iterate over the repos and store them in an object
-    infos = []
-    for repo in repos:
-        info = RepositoryInfo(repo["local-name"], repo["uri"], repo["version"])
-        infos.append(info)
-    return infos
+# the shell and platform don't change while the process runs
+IS_BASH = "bash" in os.environ.get("SHELL", "")
+IS_WINDOWS = platform.system() == "Windows"
 
 
 def is_bash():
-    return "bash" in os.environ.get("SHELL", "")
+    return IS_BASH
 
 
 def is_windows():
-    return platform.system() == "Windows"
+    return IS_WINDOWS